@@ -1,5 +1,8 @@
 import streamlit as st
-import requests
+import httpx
+import msgpack
+import msgpack_numpy
+import orjson
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
@@ -12,19 +15,81 @@ st.set_page_config(
 )
 
 API_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
+# Indicator charts ask the API to downsample long ranges to this many points.
+MAX_CHART_POINTS = 2000
 
 # --- Helper Functions to Fetch Data from API ---
 
-def fetch_data(endpoint):
-    """Generic function to fetch data from the API."""
+@st.cache_resource
+def get_client():
+    """Shared HTTP client, kept across Streamlit reruns so connections are reused."""
+    return httpx.Client(
+        base_url=API_URL,
+        # Data endpoints answer in msgpack when asked, which decodes straight to NumPy arrays.
+        headers={"Accept": "application/msgpack, application/json"},
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+    )
+
+def _get_json(endpoint):
+    """Fetches and decodes an API response, msgpack or JSON depending on what the server sent."""
+    response = get_client().get(f"/{endpoint}")
+    response.raise_for_status()  # Raise an exception for bad status codes
+    if response.headers.get("content-type", "").startswith("application/msgpack"):
+        return msgpack.unpackb(response.content, object_hook=msgpack_numpy.decode)
+    return orjson.loads(response.content)
+
+def fetch_data(loader, *args):
+    """Runs one of the cached loaders below, reporting API errors instead of raising them."""
     try:
-        response = requests.get(f"{API_URL}/{endpoint}")
-        response.raise_for_status()  # Raise an exception for bad status codes
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return loader(*args)
+    except httpx.HTTPError as e:
         st.error(f"Error connecting to API: {e}")
         return None
 
+# Loaders turn API responses into DataFrames. They are cached per argument set so a
+# rerun with the same inputs skips both the request and the parsing. Errors propagate
+# out of the cache, so failed requests are retried on the next rerun.
+
+def _parse_dates(dates):
+    return pd.to_datetime(dates, format='%Y-%m-%d', cache=True)
+
+def _columns_frame(columns, **rename):
+    """Builds a date-indexed frame from the API's parallel-array payloads."""
+    values = {rename.get(name, name): column for name, column in columns.items() if name != 'dates'}
+    return pd.DataFrame(values, index=_parse_dates(columns['dates']).rename('Date'))
+
+def _history_frame(history):
+    return _columns_frame(history, open='Open', high='High', low='Low', close='Close', volume='Volume')
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_info(ticker):
+    return _get_json(f"stocks/{ticker}/info").get("info", {})
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_history(ticker):
+    return _history_frame(_get_json(f"stocks/{ticker}/history")['history'])
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_sma(ticker, window):
+    bundle = _get_json(f"stocks/{ticker}/bundle?indicators=sma&sma_window={window}&max_points={MAX_CHART_POINTS}")
+    return _history_frame(bundle['history']), _columns_frame(bundle['sma'], values='SMA')
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_bbands(ticker, window, num_std):
+    bundle = _get_json(f"stocks/{ticker}/bundle?indicators=bbands&bb_window={window}&num_std={num_std}&max_points={MAX_CHART_POINTS}")
+    return _history_frame(bundle['history']), _columns_frame(bundle['bands'])
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_macd(ticker, fast, slow, signal):
+    bundle = _get_json(f"stocks/{ticker}/bundle?indicators=macd&fast={fast}&slow={slow}&signal={signal}&max_points={MAX_CHART_POINTS}")
+    return _history_frame(bundle['history']), _columns_frame(bundle['macd'])
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_rsi(ticker, window):
+    bundle = _get_json(f"stocks/{ticker}/bundle?indicators=rsi&rsi_window={window}&max_points={MAX_CHART_POINTS}")
+    return _history_frame(bundle['history']), _columns_frame(bundle['rsi'], values='RSI')
+
 def format_market_cap(value):
     """Formats a large number into a readable string (e.g., 2.5T, 150.3B)."""
     if value is None:
@@ -62,9 +127,8 @@ if ticker:
     # --- Company Information ---
     if analysis_type == "Company Information":
         st.header(f"Company Information: {ticker}")
-        data = fetch_data(f"stocks/{ticker}/info")
-        if data:
-            info = data.get("info", {})
+        info = fetch_data(load_info, ticker)
+        if info:
             st.subheader(info.get('longName', 'N/A'))
             
             col1, col2, col3 = st.columns(3)
@@ -78,12 +142,8 @@ if ticker:
     # --- Historical Price ---
     elif analysis_type == "Historical Price":
         st.header(f"Historical Price Chart: {ticker}")
-        history_data = fetch_data(f"stocks/{ticker}/history")
-        if history_data:
-            df = pd.DataFrame(history_data['history'])
-            df['Date'] = pd.to_datetime(df['Date'])
-            df.set_index('Date', inplace=True)
-            
+        df = fetch_data(load_history, ticker)
+        if df is not None:
             fig = go.Figure(data=[go.Candlestick(
                 x=df.index,
                 open=df['Open'],
@@ -102,20 +162,14 @@ if ticker:
         st.header(f"Simple Moving Average (SMA): {ticker}")
         window = st.sidebar.slider("SMA Window", min_value=5, max_value=200, value=20, step=5)
         
-        history_data = fetch_data(f"stocks/{ticker}/history")
-        sma_data = fetch_data(f"technicals/{ticker}/sma?window={window}")
+        frames = fetch_data(load_sma, ticker, window)
         
-        if history_data and sma_data:
-            df_hist = pd.DataFrame(history_data['history'])
-            df_hist['Date'] = pd.to_datetime(df_hist['Date'])
-            
-            df_sma = pd.Series(sma_data['sma']).reset_index()
-            df_sma.columns = ['Date', 'SMA']
-            df_sma['Date'] = pd.to_datetime(df_sma['Date'])
+        if frames:
+            df_hist, df_sma = frames
             
             fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df_hist['Date'], y=df_hist['Close'], mode='lines', name='Close Price'))
-            fig.add_trace(go.Scatter(x=df_sma['Date'], y=df_sma['SMA'], mode='lines', name=f'{window}-Day SMA'))
+            fig.add_trace(go.Scattergl(x=df_hist.index, y=df_hist['Close'], mode='lines', name='Close Price'))
+            fig.add_trace(go.Scattergl(x=df_sma.index, y=df_sma['SMA'], mode='lines', name=f'{window}-Day SMA'))
             fig.update_layout(title=f'{ticker} Price with {window}-Day SMA')
             st.plotly_chart(fig, use_container_width=True)
 
@@ -125,21 +179,16 @@ if ticker:
         window = st.sidebar.slider("Window", min_value=5, max_value=50, value=20, step=1)
         num_std = st.sidebar.slider("Standard Deviations", min_value=1, max_value=4, value=2, step=1)
 
-        history_data = fetch_data(f"stocks/{ticker}/history")
-        bbands_data = fetch_data(f"technicals/{ticker}/bbands?window={window}&num_std={num_std}")
-
-        if history_data and bbands_data:
-            df_hist = pd.DataFrame(history_data['history'])
-            df_hist['Date'] = pd.to_datetime(df_hist['Date'])
+        frames = fetch_data(load_bbands, ticker, window, num_std)
 
-            df_bbands = pd.DataFrame.from_dict(bbands_data['bands'], orient='index')
-            df_bbands.index = pd.to_datetime(df_bbands.index)
+        if frames:
+            df_hist, df_bbands = frames
 
             fig = go.Figure()
-            fig.add_trace(go.Scatter(x=df_hist['Date'], y=df_hist['Close'], mode='lines', name='Close Price', line=dict(color='blue')))
-            fig.add_trace(go.Scatter(x=df_bbands.index, y=df_bbands['Upper_Band'], mode='lines', name='Upper Band', line=dict(width=0.5, color='gray')))
-            fig.add_trace(go.Scatter(x=df_bbands.index, y=df_bbands['Lower_Band'], mode='lines', name='Lower Band', line=dict(width=0.5, color='gray'), fill='tonexty', fillcolor='rgba(128,128,128,0.2)'))
-            fig.add_trace(go.Scatter(x=df_bbands.index, y=df_bbands['Middle_Band'], mode='lines', name='Middle Band (SMA)', line=dict(dash='dash', color='orange')))
+            fig.add_trace(go.Scattergl(x=df_hist.index, y=df_hist['Close'], mode='lines', name='Close Price', line=dict(color='blue')))
+            fig.add_trace(go.Scattergl(x=df_bbands.index, y=df_bbands['Upper_Band'], mode='lines', name='Upper Band', line=dict(width=0.5, color='gray')))
+            fig.add_trace(go.Scattergl(x=df_bbands.index, y=df_bbands['Lower_Band'], mode='lines', name='Lower Band', line=dict(width=0.5, color='gray'), fill='tonexty', fillcolor='rgba(128,128,128,0.2)'))
+            fig.add_trace(go.Scattergl(x=df_bbands.index, y=df_bbands['Middle_Band'], mode='lines', name='Middle Band (SMA)', line=dict(dash='dash', color='orange')))
             fig.update_layout(title=f'{ticker} Bollinger Bands')
             st.plotly_chart(fig, use_container_width=True)
 
@@ -150,22 +199,17 @@ if ticker:
         slow = st.sidebar.slider("Slow Period", 10, 100, 26, 1)
         signal = st.sidebar.slider("Signal Period", 1, 50, 9, 1)
         
-        history_data = fetch_data(f"stocks/{ticker}/history")
-        macd_data = fetch_data(f"technicals/{ticker}/macd?fast={fast}&slow={slow}&signal={signal}")
+        frames = fetch_data(load_macd, ticker, fast, slow, signal)
 
-        if history_data and macd_data:
-            df_hist = pd.DataFrame(history_data['history'])
-            df_hist['Date'] = pd.to_datetime(df_hist['Date'])
-            
-            df_macd = pd.DataFrame.from_dict(macd_data['macd'], orient='index')
-            df_macd.index = pd.to_datetime(df_macd.index)
+        if frames:
+            df_hist, df_macd = frames
 
             fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.1, row_heights=[0.7, 0.3])
             # Price Chart
-            fig.add_trace(go.Scatter(x=df_hist['Date'], y=df_hist['Close'], mode='lines', name='Close Price'), row=1, col=1)
+            fig.add_trace(go.Scattergl(x=df_hist.index, y=df_hist['Close'], mode='lines', name='Close Price'), row=1, col=1)
             # MACD Chart
-            fig.add_trace(go.Scatter(x=df_macd.index, y=df_macd['MACD_Line'], mode='lines', name='MACD Line'), row=2, col=1)
-            fig.add_trace(go.Scatter(x=df_macd.index, y=df_macd['Signal_Line'], mode='lines', name='Signal Line'), row=2, col=1)
+            fig.add_trace(go.Scattergl(x=df_macd.index, y=df_macd['MACD_Line'], mode='lines', name='MACD Line'), row=2, col=1)
+            fig.add_trace(go.Scattergl(x=df_macd.index, y=df_macd['Signal_Line'], mode='lines', name='Signal Line'), row=2, col=1)
             fig.add_trace(go.Bar(x=df_macd.index, y=df_macd['Histogram'], name='Histogram'), row=2, col=1)
             fig.update_layout(title=f'{ticker} Price and MACD', yaxis2_title='MACD')
             st.plotly_chart(fig, use_container_width=True)
@@ -175,22 +219,16 @@ if ticker:
         st.header(f"Relative Strength Index (RSI): {ticker}")
         window = st.sidebar.slider("RSI Window", min_value=5, max_value=50, value=14, step=1)
         
-        history_data = fetch_data(f"stocks/{ticker}/history")
-        rsi_data = fetch_data(f"technicals/{ticker}/rsi?window={window}")
+        frames = fetch_data(load_rsi, ticker, window)
 
-        if history_data and rsi_data:
-            df_hist = pd.DataFrame(history_data['history'])
-            df_hist['Date'] = pd.to_datetime(df_hist['Date'])
-            
-            df_rsi = pd.Series(rsi_data['rsi']).reset_index()
-            df_rsi.columns = ['Date', 'RSI']
-            df_rsi['Date'] = pd.to_datetime(df_rsi['Date'])
+        if frames:
+            df_hist, df_rsi = frames
 
             fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.1, row_heights=[0.7, 0.3])
             # Price Chart
-            fig.add_trace(go.Scatter(x=df_hist['Date'], y=df_hist['Close'], mode='lines', name='Close Price'), row=1, col=1)
+            fig.add_trace(go.Scattergl(x=df_hist.index, y=df_hist['Close'], mode='lines', name='Close Price'), row=1, col=1)
             # RSI Chart
-            fig.add_trace(go.Scatter(x=df_rsi['Date'], y=df_rsi['RSI'], mode='lines', name='RSI'), row=2, col=1)
+            fig.add_trace(go.Scattergl(x=df_rsi.index, y=df_rsi['RSI'], mode='lines', name='RSI'), row=2, col=1)
             fig.add_hline(y=70, line_dash="dash", line_color="red", row=2, col=1)
             fig.add_hline(y=30, line_dash="dash", line_color="green", row=2, col=1)
             fig.update_layout(title=f'{ticker} Price and RSI', yaxis2_title='RSI')
@@ -1,99 +1,307 @@
 import yfinance as yf
 import pandas as pd
 import numpy as np
-from fastapi import FastAPI, Query, HTTPException
+import diskcache
+import msgpack
+import msgpack_numpy
+import functools
+import time
+from numba import njit
+from tsdownsample import MinMaxLTTBDownsampler
+from fastapi import FastAPI, Query, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import date, timedelta
 
-class PriceData(BaseModel):
-    Date: str
-    Open: float
-    High: float
-    Low: float
-    Close: float
-    Volume: int
-
-class HistoricalDataResponse(BaseModel):
-    ticker: str
-    history: List[PriceData]
-
-class SMAResponse(BaseModel):
-    ticker: str
-    sma: Dict[str, float | None]
-
 class StockInfoResponse(BaseModel):
     ticker: str
     info: Dict[str, Any]
 
-class BollingerBandsData(BaseModel):
-    Middle_Band: Optional[float] = None
-    Upper_Band: Optional[float] = None
-    Lower_Band: Optional[float] = None
 
-class BollingerBandsResponse(BaseModel):
-    ticker: str
-    bands: Dict[str, BollingerBandsData]
+# On-disk cache for yfinance responses, shared across requests and restarts.
+cache = diskcache.Cache("./.cache_yf")
+YF_CACHE_EXPIRE = 3600
 
-class MACDData(BaseModel):
-    MACD_Line: Optional[float] = None
-    Signal_Line: Optional[float] = None
-    Histogram: Optional[float] = None
+class HistoryUnavailable(Exception):
+    """Raised inside the memoized fetch so empty results (often swallowed yfinance errors) are never cached."""
 
-class MACDResponse(BaseModel):
-    ticker: str
-    macd: Dict[str, MACDData]
+@cache.memoize(expire=YF_CACHE_EXPIRE)
+def _fetch_history(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    stock = yf.Ticker(ticker)
+    hist = stock.history(start=start_date, end=end_date)
+    if hist.empty:
+        raise HistoryUnavailable(ticker)
+    return hist
 
-class RSIResponse(BaseModel):
-    ticker: str
-    rsi: Dict[str, float | None]
+@cache.memoize(expire=YF_CACHE_EXPIRE)
+def _fetch_info(ticker: str) -> dict:
+    return yf.Ticker(ticker).info
+
+# In-process layer over the disk cache for back-to-back requests. The time bucket in the
+# key caps staleness; lru_cache evicts by recency.
+MEMORY_CACHE_TTL = 300
+
+@functools.lru_cache(maxsize=256)
+def _memory_history(ticker: str, start_date: str, end_date: str, ttl_bucket: int) -> pd.DataFrame:
+    return _fetch_history(ticker, start_date, end_date)
 
 def get_stock_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
-    stock = yf.Ticker(ticker)
-    hist = stock.history(start=start_date, end=end_date)
-    return hist if not hist.empty else pd.DataFrame()
+    ttl_bucket = int(time.time() // MEMORY_CACHE_TTL)
+    try:
+        # Hand out a copy so callers can't modify the cached frame.
+        return _memory_history(ticker.upper(), start_date, end_date, ttl_bucket).copy()
+    except HistoryUnavailable:
+        return pd.DataFrame()
+
+def get_stock_data_batch(tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+    """History for several tickers, downloading every uncached one in a single threaded yf.download call.
+
+    Results are written to the same cache entries get_stock_data reads, so later single-ticker
+    requests for the same range are already warm. Tickers with no data come back empty and are not cached.
+    """
+    tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+    keys = {ticker: _fetch_history.__cache_key__(ticker, start_date, end_date) for ticker in tickers}
+    missing = [ticker for ticker in tickers if keys[ticker] not in cache]
+    unavailable = set()
+    if missing:
+        # ignore_tz=True keeps each ticker's exchange-local dates; with tz-aware indexes yfinance
+        # converts the whole batch to its most common timezone, shifting other exchanges' days.
+        raw = yf.download(missing, start=start_date, end=end_date, group_by='ticker', threads=True,
+                          auto_adjust=True, ignore_tz=True, progress=False)
+        downloaded = set(raw.columns.get_level_values(0)) if isinstance(raw.columns, pd.MultiIndex) else set()
+        for ticker in missing:
+            # Tickers trading on fewer days, or not at all, come back as all-NaN rows.
+            hist = raw[ticker].dropna(how='all') if ticker in downloaded else pd.DataFrame()
+            if hist.empty:
+                # Failed, rate-limited or unknown: report it, but leave the cache free to retry.
+                unavailable.add(ticker)
+                continue
+            cache.set(keys[ticker], hist, expire=YF_CACHE_EXPIRE)
+    return {ticker: pd.DataFrame() if ticker in unavailable else get_stock_data(ticker, start_date, end_date)
+            for ticker in tickers}
 
 def get_company_info(ticker: str) -> dict:
-    stock = yf.Ticker(ticker)
     try:
-        return stock.info
+        return _fetch_info(ticker.upper())
     except Exception:
         return {}
 
-def calculate_bollinger_bands(data: pd.DataFrame, window: int, num_std: int):
+@njit(cache=True)
+def _roll_mean_std(x, w):
+    """Rolling mean and sample std (ddof=1) in one pass; NaN until a full window of valid values."""
+    n = x.shape[0]
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    # Shift by a reference value so the running sums stay small and sum-of-squares keeps its precision.
+    shift = 0.0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            shift = x[i]
+            break
+    total = 0.0
+    total_sq = 0.0
+    count = 0
+    for i in range(n):
+        v = x[i]
+        if not np.isnan(v):
+            d = v - shift
+            total += d
+            total_sq += d * d
+            count += 1
+        if i >= w:
+            old = x[i - w]
+            if not np.isnan(old):
+                d = old - shift
+                total -= d
+                total_sq -= d * d
+                count -= 1
+        if count == w:
+            mean[i] = total / w + shift
+            if w > 1:
+                var = (total_sq - total * total / w) / (w - 1)
+                std[i] = np.sqrt(var) if var > 0.0 else 0.0
+    return mean, std
+
+def calculate_rolling_mean_std(data: pd.DataFrame, window: int) -> Tuple[pd.Series, pd.Series]:
+    # The kernel doesn't bounds-check, so a non-positive window would read past the array.
+    if window < 1:
+        raise ValueError(f"window must be at least 1, got {window}")
     close_price = data['Close']
-    middle_band = close_price.rolling(window=window).mean()
-    std_dev = close_price.rolling(window=window).std()
+    mean, std = _roll_mean_std(close_price.to_numpy(dtype=np.float64), window)
+    return pd.Series(mean, index=close_price.index), pd.Series(std, index=close_price.index)
+
+def calculate_bollinger_bands(data: pd.DataFrame, window: int, num_std: int, mean_std: Optional[Tuple[pd.Series, pd.Series]] = None):
+    middle_band, std_dev = mean_std if mean_std is not None else calculate_rolling_mean_std(data, window)
     upper_band = middle_band + (std_dev * num_std)
     lower_band = middle_band - (std_dev * num_std)
     return middle_band, upper_band, lower_band
 
+@njit(cache=True)
+def _macd(close, fast, slow, signal):
+    """MACD line, signal line and histogram in one pass; matches pandas ewm(span, adjust=False)."""
+    n = close.shape[0]
+    macd_line = np.full(n, np.nan)
+    signal_line = np.full(n, np.nan)
+    histogram = np.full(n, np.nan)
+    a_fast = 2.0 / (fast + 1.0)
+    a_slow = 2.0 / (slow + 1.0)
+    a_signal = 2.0 / (signal + 1.0)
+    ema_fast = np.nan
+    ema_slow = np.nan
+    ema_signal = np.nan
+    gap = 0
+    for i in range(n):
+        x = close[i]
+        if np.isnan(x):
+            # Missing closes carry the EMAs forward and decay the old weight, as pandas does.
+            gap += 1
+        elif np.isnan(ema_fast):
+            ema_fast = x
+            ema_slow = x
+            gap = 0
+        else:
+            w_fast = (1.0 - a_fast) ** (gap + 1)
+            w_slow = (1.0 - a_slow) ** (gap + 1)
+            ema_fast = (w_fast * ema_fast + a_fast * x) / (w_fast + a_fast)
+            ema_slow = (w_slow * ema_slow + a_slow * x) / (w_slow + a_slow)
+            gap = 0
+        if np.isnan(ema_fast):
+            continue
+        m = ema_fast - ema_slow
+        ema_signal = m if np.isnan(ema_signal) else a_signal * m + (1.0 - a_signal) * ema_signal
+        macd_line[i] = m
+        signal_line[i] = ema_signal
+        histogram[i] = m - ema_signal
+    return macd_line, signal_line, histogram
+
 def calculate_macd(data: pd.DataFrame, fast_period: int, slow_period: int, signal_period: int):
+    if min(fast_period, slow_period, signal_period) < 1:
+        raise ValueError(f"MACD periods must be at least 1, got {fast_period}/{slow_period}/{signal_period}")
     close_price = data['Close']
-    ema_fast = close_price.ewm(span=fast_period, adjust=False).mean()
-    ema_slow = close_price.ewm(span=slow_period, adjust=False).mean()
-    macd_line = ema_fast - ema_slow
-    signal_line = macd_line.ewm(span=signal_period, adjust=False).mean()
-    histogram = macd_line - signal_line
-    return macd_line, signal_line, histogram
+    index = close_price.index
+    macd_line, signal_line, histogram = _macd(close_price.to_numpy(dtype=np.float64), fast_period, slow_period, signal_period)
+    return pd.Series(macd_line, index=index), pd.Series(signal_line, index=index), pd.Series(histogram, index=index)
+
+@njit(cache=True)
+def _rsi(close, w):
+    """RSI with Wilder smoothing: averages seeded with the mean of the first w moves, NaN before that."""
+    n = close.shape[0]
+    out = np.full(n, np.nan)
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0.0 else 0.0
+        loss = -delta if delta < 0.0 else 0.0
+        if i <= w:
+            avg_gain += gain / w
+            avg_loss += loss / w
+            if i < w:
+                continue
+        else:
+            avg_gain = (avg_gain * (w - 1) + gain) / w
+            avg_loss = (avg_loss * (w - 1) + loss) / w
+        if avg_loss > 0.0:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        elif avg_gain > 0.0:
+            out[i] = 100.0
+    return out
 
 def calculate_rsi(data: pd.DataFrame, window: int):
+    if window < 1:
+        raise ValueError(f"window must be at least 1, got {window}")
     close_price = data['Close']
-    delta = close_price.diff(1)
-    gain = delta.where(delta > 0, 0).fillna(0)
-    loss = -delta.where(delta < 0, 0).fillna(0)
-    avg_gain = gain.rolling(window=window, min_periods=1).mean()
-    avg_loss = loss.rolling(window=window, min_periods=1).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100.0 - (100.0 / (1.0 + rs))
-    return rsi
+    return pd.Series(_rsi(close_price.to_numpy(dtype=np.float64), window), index=close_price.index)
+
+def downsample_rows(data: pd.DataFrame, max_points: Optional[int]) -> Optional[np.ndarray]:
+    """Positions of at most max_points rows picked by MinMaxLTTB on the close; None keeps every row."""
+    if max_points is None or len(data) <= max_points:
+        return None
+    return MinMaxLTTBDownsampler().downsample(data['Close'].to_numpy(dtype=np.float64), n_out=max_points)
+
+def take_rows(obj, rows: Optional[np.ndarray]):
+    return obj if rows is None else obj.iloc[rows]
+
+PRICE_COLUMNS = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close'}
+
+def build_history(data: pd.DataFrame) -> Dict[str, Any]:
+    """Columnar OHLCV: 'dates' plus one array per field, downcast for the wire only.
+
+    Prices go out as float32, which is about 7 significant digits: enough for charts, but a
+    BRK-A-sized price loses its cents. The cached frame and the indicators keep float64.
+    Volume is downcast only as far as the data allows, since split-adjusted volumes can
+    exceed uint32.
+    """
+    history = {"dates": data.index.strftime('%Y-%m-%d').tolist()}
+    history.update((key, data[column].to_numpy(dtype=np.float32)) for column, key in PRICE_COLUMNS.items())
+    history["volume"] = np.ascontiguousarray(pd.to_numeric(data['Volume'], downcast='unsigned').to_numpy())
+    return history
+
+def frame_to_columns(frame: pd.DataFrame) -> Dict[str, Any]:
+    """Parallel arrays: 'dates' plus one float64 array per column, with +/-inf replaced by NaN."""
+    columns = {"dates": frame.index.strftime('%Y-%m-%d').tolist()}
+    for name, values in frame.items():
+        values = values.to_numpy(dtype=np.float64, copy=True)
+        values[np.isinf(values)] = np.nan
+        columns[name] = values
+    return columns
+
+def series_to_columns(series: pd.Series) -> Dict[str, Any]:
+    return frame_to_columns(series.to_frame("values"))
+
+def build_sma(data: pd.DataFrame, window: int, rows: Optional[np.ndarray] = None, mean_std: Optional[Tuple[pd.Series, pd.Series]] = None) -> Dict[str, Any]:
+    sma, _ = mean_std if mean_std is not None else calculate_rolling_mean_std(data, window)
+    return series_to_columns(take_rows(sma, rows))
+
+def build_bollinger_bands(data: pd.DataFrame, window: int, num_std: int, rows: Optional[np.ndarray] = None, mean_std: Optional[Tuple[pd.Series, pd.Series]] = None) -> Dict[str, Any]:
+    middle, upper, lower = calculate_bollinger_bands(data, window, num_std, mean_std)
+    bands = pd.concat({'Middle_Band': middle, 'Upper_Band': upper, 'Lower_Band': lower}, axis=1)
+    return frame_to_columns(take_rows(bands, rows))
+
+def build_macd(data: pd.DataFrame, fast: int, slow: int, signal: int, rows: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    macd_line, signal_line, histogram = calculate_macd(data, fast, slow, signal)
+    macd = pd.concat({'MACD_Line': macd_line, 'Signal_Line': signal_line, 'Histogram': histogram}, axis=1)
+    return frame_to_columns(take_rows(macd, rows))
+
+def build_rsi(data: pd.DataFrame, window: int, rows: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    return series_to_columns(take_rows(calculate_rsi(data, window), rows))
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+def respond(request: Request, payload: Dict[str, Any]) -> Response:
+    """Encodes the payload as msgpack (arrays via msgpack-numpy) if the client accepts it, else as JSON.
+
+    Either way the response is built directly, skipping FastAPI's jsonable_encoder pass. orjson writes
+    NumPy arrays natively and emits NaN as null.
+    """
+    if MSGPACK_MEDIA_TYPE in request.headers.get("accept", ""):
+        return Response(msgpack.packb(payload, default=msgpack_numpy.encode), media_type=MSGPACK_MEDIA_TYPE)
+    return ORJSONResponse(payload)
+
+BUNDLE_INDICATORS = ("sma", "bbands", "macd", "rsi")
+
+MAX_POINTS_QUERY = Query(None, ge=3, description="Downsample to at most this many points (MinMaxLTTB on the close)")
 
 app = FastAPI(
     title="Quant Dashboard API",
     description="An API for fetching financial data and technical indicators.",
-    version="2.1.0"
+    version="2.1.0",
+    default_response_class=ORJSONResponse
 )
 
+@app.on_event("startup")
+def clear_memory_cache():
+    _memory_history.cache_clear()
+
+@app.on_event("startup")
+def warm_kernels():
+    # Compile (or load from Numba's on-disk cache) before the first request needs them.
+    x = np.arange(64, dtype=np.float64)
+    _roll_mean_std(x, 20)
+    _rsi(x, 14)
+    _macd(x, 12, 26, 9)
+
 @app.get("/", tags=["Root"])
 async def read_root():
     return {"message": "Welcome to the Quant Dashboard API v2!"}
@@ -116,94 +324,126 @@ async def get_stock_info(ticker: str):
     }
     return StockInfoResponse(ticker=ticker, info=filtered_info)
 
-@app.get("/stocks/{ticker}/history", response_model=HistoricalDataResponse, tags=["Stocks"])
-async def get_historical_data(ticker: str, start_date: Optional[date] = None, end_date: Optional[date] = None):
+# Registered ahead of /stocks/{ticker}/history so "batch" isn't taken as a ticker.
+@app.get("/stocks/batch/history", response_model=None, tags=["Stocks"])
+async def get_batch_history(
+    request: Request,
+    tickers: str = Query(..., description="Comma-separated tickers, e.g. AAPL,MSFT"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    max_points: Optional[int] = MAX_POINTS_QUERY,
+):
+    names = [name.strip() for name in tickers.split(",") if name.strip()]
+    if not names:
+        raise HTTPException(status_code=400, detail="No tickers given")
+    if end_date is None: end_date = date.today()
+    if start_date is None: start_date = end_date - timedelta(days=365)
+    frames = get_stock_data_batch(names, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+
+    history = {ticker: build_history(take_rows(data, downsample_rows(data, max_points)))
+               for ticker, data in frames.items() if not data.empty}
+    if not history:
+        raise HTTPException(status_code=404, detail=f"No historical data found for tickers '{tickers}'")
+    missing = [ticker for ticker, data in frames.items() if data.empty]
+    return respond(request, {"tickers": list(history), "missing": missing, "history": history})
+
+@app.get("/stocks/{ticker}/history", response_model=None, tags=["Stocks"])
+async def get_historical_data(ticker: str, request: Request, start_date: Optional[date] = None, end_date: Optional[date] = None, max_points: Optional[int] = MAX_POINTS_QUERY):
     if end_date is None: end_date = date.today()
     if start_date is None: start_date = end_date - timedelta(days=365)
     data = get_stock_data(ticker, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
     if data.empty:
         raise HTTPException(status_code=404, detail=f"No historical data found for ticker '{ticker}'")
     
-    data.reset_index(inplace=True)
-    history_list = [
-        PriceData(
-            Date=row['Date'].strftime('%Y-%m-%d'),
-            Open=row['Open'],
-            High=row['High'],
-            Low=row['Low'],
-            Close=row['Close'],
-            Volume=row['Volume']
-        ) for _, row in data.iterrows()
-    ]
-    return HistoricalDataResponse(ticker=ticker, history=history_list)
-
-@app.get("/technicals/{ticker}/sma", response_model=SMAResponse, tags=["Technicals"])
-async def get_sma(ticker: str, window: int = 20, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    return respond(request, {"ticker": ticker, "history": build_history(take_rows(data, downsample_rows(data, max_points)))})
+
+@app.get("/stocks/{ticker}/bundle", response_model=None, tags=["Stocks"])
+async def get_bundle(
+    ticker: str,
+    request: Request,
+    indicators: str = Query("", description="Comma-separated indicators: sma, bbands, macd, rsi"),
+    sma_window: int = Query(20, ge=1),
+    bb_window: int = Query(20, ge=1),
+    num_std: int = 2,
+    fast: int = Query(12, ge=1),
+    slow: int = Query(26, ge=1),
+    signal: int = Query(9, ge=1),
+    rsi_window: int = Query(14, ge=1),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    max_points: Optional[int] = MAX_POINTS_QUERY,
+):
+    requested = [name.strip().lower() for name in indicators.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(BUNDLE_INDICATORS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown indicators: {', '.join(unknown)}")
+
+    windows = {"sma": sma_window, "bbands": bb_window, "macd": slow, "rsi": rsi_window}
+    if end_date is None: end_date = date.today()
+    if start_date is None: start_date = end_date - timedelta(days=365)
+    # Fetch once with enough lead-in for the longest requested window.
+    lookback = max((windows[name] for name in requested), default=0)
+    fetch_start = start_date - timedelta(days=lookback)
+    data = get_stock_data(ticker, fetch_start.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
+    if data.empty:
+        raise HTTPException(status_code=404, detail=f"No historical data found for ticker '{ticker}'")
+
+    # History covers the requested range only; indicators keep their lead-in like the /technicals endpoints.
+    # Every series is sampled at the same rows so the dates line up across the response.
+    rows = downsample_rows(data, max_points)
+    history = take_rows(data, rows)
+    history = history[history.index >= pd.Timestamp(start_date, tz=data.index.tz)]
+    bundle = {"ticker": ticker, "history": build_history(history)}
+    # The SMA is the Bollinger middle band, so compute the rolling pass once when the windows match.
+    shared = None
+    if "sma" in requested and "bbands" in requested and sma_window == bb_window:
+        shared = calculate_rolling_mean_std(data, sma_window)
+    if "sma" in requested:
+        bundle["sma"] = build_sma(data, sma_window, rows, shared)
+    if "bbands" in requested:
+        bundle["bands"] = build_bollinger_bands(data, bb_window, num_std, rows, shared)
+    if "macd" in requested:
+        bundle["macd"] = build_macd(data, fast, slow, signal, rows)
+    if "rsi" in requested:
+        bundle["rsi"] = build_rsi(data, rsi_window, rows)
+    return respond(request, bundle)
+
+@app.get("/technicals/{ticker}/sma", response_model=None, tags=["Technicals"])
+async def get_sma(ticker: str, request: Request, window: int = Query(20, ge=1), start_date: Optional[date] = None, end_date: Optional[date] = None, max_points: Optional[int] = MAX_POINTS_QUERY):
     if end_date is None: end_date = date.today()
     if start_date is None: start_date = end_date - timedelta(days=365 + window)
     data = get_stock_data(ticker, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
     if data.empty:
         raise HTTPException(status_code=404, detail=f"No data for SMA calculation for ticker '{ticker}'")
     
-    sma_series = data['Close'].rolling(window=window).mean()
-    sma_series.replace([np.inf, -np.inf], np.nan, inplace=True)
-    sma_dict = {date.strftime('%Y-%m-%d'): (None if pd.isna(val) else val) for date, val in sma_series.items()}
-    return SMAResponse(ticker=ticker, sma=sma_dict)
+    return respond(request, {"ticker": ticker, "sma": build_sma(data, window, downsample_rows(data, max_points))})
 
-@app.get("/technicals/{ticker}/bbands", response_model=BollingerBandsResponse, tags=["Technicals"])
-async def get_bollinger_bands(ticker: str, window: int = 20, num_std: int = 2, start_date: Optional[date] = None, end_date: Optional[date] = None):
+@app.get("/technicals/{ticker}/bbands", response_model=None, tags=["Technicals"])
+async def get_bollinger_bands(ticker: str, request: Request, window: int = Query(20, ge=1), num_std: int = 2, start_date: Optional[date] = None, end_date: Optional[date] = None, max_points: Optional[int] = MAX_POINTS_QUERY):
     if end_date is None: end_date = date.today()
     if start_date is None: start_date = end_date - timedelta(days=365 + window)
     data = get_stock_data(ticker, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
     if data.empty:
         raise HTTPException(status_code=404, detail=f"No data for Bollinger Bands calculation for ticker '{ticker}'")
 
-    middle, upper, lower = calculate_bollinger_bands(data, window, num_std)
-    result = {}
-    for idx in middle.index:
-        date_str = idx.strftime('%Y-%m-%d')
-        middle_val = middle.get(idx)
-        upper_val = upper.get(idx)
-        lower_val = lower.get(idx)
-        result[date_str] = BollingerBandsData(
-            Middle_Band=middle_val if pd.notna(middle_val) and np.isfinite(middle_val) else None,
-            Upper_Band=upper_val if pd.notna(upper_val) and np.isfinite(upper_val) else None,
-            Lower_Band=lower_val if pd.notna(lower_val) and np.isfinite(lower_val) else None
-        )
-    return BollingerBandsResponse(ticker=ticker, bands=result)
-
-@app.get("/technicals/{ticker}/macd", response_model=MACDResponse, tags=["Technicals"])
-async def get_macd(ticker: str, fast: int = 12, slow: int = 26, signal: int = 9, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    return respond(request, {"ticker": ticker, "bands": build_bollinger_bands(data, window, num_std, downsample_rows(data, max_points))})
+
+@app.get("/technicals/{ticker}/macd", response_model=None, tags=["Technicals"])
+async def get_macd(ticker: str, request: Request, fast: int = Query(12, ge=1), slow: int = Query(26, ge=1), signal: int = Query(9, ge=1), start_date: Optional[date] = None, end_date: Optional[date] = None, max_points: Optional[int] = MAX_POINTS_QUERY):
     if end_date is None: end_date = date.today()
     if start_date is None: start_date = end_date - timedelta(days=365 + slow)
     data = get_stock_data(ticker, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
     if data.empty:
         raise HTTPException(status_code=404, detail=f"No data for MACD calculation for ticker '{ticker}'")
 
-    macd_line, signal_line, histogram = calculate_macd(data, fast, slow, signal)
-    result = {}
-    for idx in macd_line.index:
-        date_str = idx.strftime('%Y-%m-%d')
-        macd_val = macd_line.get(idx)
-        signal_val = signal_line.get(idx)
-        hist_val = histogram.get(idx)
-        result[date_str] = MACDData(
-            MACD_Line=macd_val if pd.notna(macd_val) and np.isfinite(macd_val) else None,
-            Signal_Line=signal_val if pd.notna(signal_val) and np.isfinite(signal_val) else None,
-            Histogram=hist_val if pd.notna(hist_val) and np.isfinite(hist_val) else None
-        )
-    return MACDResponse(ticker=ticker, macd=result)
-
-@app.get("/technicals/{ticker}/rsi", response_model=RSIResponse, tags=["Technicals"])
-async def get_rsi(ticker: str, window: int = 14, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    return respond(request, {"ticker": ticker, "macd": build_macd(data, fast, slow, signal, downsample_rows(data, max_points))})
+
+@app.get("/technicals/{ticker}/rsi", response_model=None, tags=["Technicals"])
+async def get_rsi(ticker: str, request: Request, window: int = Query(14, ge=1), start_date: Optional[date] = None, end_date: Optional[date] = None, max_points: Optional[int] = MAX_POINTS_QUERY):
     if end_date is None: end_date = date.today()
     if start_date is None: start_date = end_date - timedelta(days=365 + window)
     data = get_stock_data(ticker, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d"))
     if data.empty:
         raise HTTPException(status_code=404, detail=f"No data for RSI calculation for ticker '{ticker}'")
     
-    rsi_series = calculate_rsi(data, window)
-    rsi_series.replace([np.inf, -np.inf], np.nan, inplace=True)
-    rsi_dict = {date.strftime('%Y-%m-%d'): (None if pd.isna(val) else val) for date, val in rsi_series.items()}
-    return RSIResponse(ticker=ticker, rsi=rsi_dict)
-
+    return respond(request, {"ticker": ticker, "rsi": build_rsi(data, window, downsample_rows(data, max_points))})